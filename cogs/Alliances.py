@@ -0,0 +1,214 @@
+# This slash command returns the playoff alliances of an event along with how strong each one is
+# The alliances come from TBA, and once they're picked the EPAs of every team at the event come from a single Statbotics call
+# Results are cached per event, and only rechecked (cheaply, with TBA's ETag) while playoffs are still going
+
+import asyncio
+import os
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.cache import ByteBoundedCache
+from utils.events import get_event_name
+from utils.projections import EventAlliances
+from utils.request_policy import Deadline, request_policy
+
+# Entries don't expire, they are rechecked against TBA instead until the event has a winner
+alliance_cache = ByteBoundedCache("alliances", max_bytes=256 * 1024)
+
+# How long to trust cached alliances for before asking TBA if they changed
+RECHECK_SECONDS = 30
+
+
+class Alliances(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Guild syncing
+    guild_ids = []
+    main = os.getenv("guild_id")
+    dev = os.getenv("dev_guild_id")
+    if main:
+        guild_ids.append(int(main))
+    if dev:
+        guild_ids.append(int(dev))
+
+    @app_commands.guilds(*guild_ids)
+    @app_commands.command(
+        name="alliances",
+        description="Get the playoff alliances of an event and their combined EPA"
+    )
+    @app_commands.describe(
+        event_key="Event key. ex. '2025oncmp1' (2025 Ontario DCMP Science) or '2025onham' (2025 McMaster U Event)"
+    )
+    async def alliances(self, interaction: discord.Interaction, event_key: str):
+
+        await interaction.response.defer()
+
+        try:
+            cached = alliance_cache.get(event_key)
+
+            # Nothing changes once the event is over, and recent results are still good
+            if cached and (cached.finished or time.monotonic() - cached.checked_at < RECHECK_SECONDS):
+                return await interaction.followup.send(embed=create_embed(cached))
+
+            # If someone else is already fetching this event, wait for their result instead of asking again
+            task = in_flight.get(event_key)
+            if task is None:
+                task = asyncio.create_task(fetch_alliances(event_key, cached))
+                in_flight[event_key] = task
+                task.add_done_callback(lambda _: in_flight.pop(event_key, None))
+
+            # Shielded so one user's command being cancelled doesn't cancel it for everyone waiting
+            result = await asyncio.shield(task)
+
+            # A string means there's nothing to show, just a message
+            if isinstance(result, str):
+                return await interaction.followup.send(result)
+
+            await interaction.followup.send(embed=create_embed(result))
+
+        except Exception as e:
+            return await interaction.followup.send(f"An error occurred:\n```\n{e}\n```")
+
+
+# event key -> the task currently fetching its alliances, so concurrent commands share one fetch
+in_flight = {}
+
+
+# Fetches (or rechecks) the alliances of an event and caches them
+# Returns the EventAlliances to show, or a message if there's nothing to show
+async def fetch_alliances(event_key, cached):
+    deadline = Deadline()
+
+    tba_key = os.getenv("tba_key")
+    headers = {"X-TBA-Auth-Key": tba_key}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+
+    alliance_request = request_policy.get(
+        "tba.alliances",
+        f"https://www.thebluealliance.com/api/v3/event/{event_key}/alliances",
+        headers=headers,
+        deadline=deadline
+    )
+
+    if cached:
+        data_request = await alliance_request
+        event_name = cached.event_name
+    else:
+        # The name is cached separately, so it isn't wasted if the alliances haven't been picked yet
+        data_request, event_name = await asyncio.gather(
+            alliance_request,
+            get_event_name(event_key, deadline)
+        )
+
+    # The alliances haven't changed since we last looked
+    if data_request.status_code == 304:
+        cached.checked_at = time.monotonic()
+        return cached
+
+    # Slightly old alliances are better than none if TBA is having trouble
+    if cached and data_request.status_code != 200:
+        return cached
+
+    if data_request.status_code == 401:
+        return "Provide a valid TBA auth key to use TBA commands"
+
+    if data_request.status_code == 404:
+        return "Invalid event key"
+
+    if data_request.status_code != 200:
+        return "TBA did not provide a response"
+
+    data = data_request.json()
+
+    if not data:
+        return "No alliances have been selected for this event yet."
+
+    etag = data_request.headers.get("ETag")
+
+    # Only go back to Statbotics if a team was picked that we haven't asked it about yet
+    teams = {team.replace("frc", "") for alliance in data for team in alliance["picks"]}
+    if cached and teams <= cached.looked_up:
+        team_epas = cached.team_epas()
+        looked_up = cached.looked_up
+    else:
+        team_epas = await get_team_epas(event_key, deadline)
+        if team_epas is not None:
+            looked_up = teams | team_epas.keys()
+        else:
+            # Statbotics failed, so keep the EPAs we already know and try again on the next recheck
+            # Dropping the ETag makes sure the next recheck gets the picks back instead of a 304
+            team_epas = cached.team_epas() if cached else {}
+            looked_up = cached.looked_up if cached else ()
+            etag = None
+
+    event_alliances = EventAlliances(event_name, data, team_epas, looked_up, etag)
+
+    # Don't hold on to results without any EPAs, so the next query tries Statbotics again
+    if team_epas:
+        alliance_cache.put(event_key, event_alliances)
+    else:
+        alliance_cache.invalidate(event_key)
+
+    return event_alliances
+
+
+# Gets the EPA of every team at the event in one call, as {team: epa}, or None if Statbotics failed
+async def get_team_epas(event_key, deadline):
+    try:
+        data = await request_policy.statbotics(
+            "statbotics.team_events", "/team_events",
+            params={"event": event_key, "limit": 1000},
+            deadline=deadline
+        )
+    except Exception:
+        return None
+
+    return {str(entry['team']): entry['epa']['total_points']['mean'] for entry in data}
+
+
+def create_embed(event_alliances):
+    # The teams column is as wide as the biggest alliance
+    teams_width = max(len(" ".join(alliance.teams)) for alliance in event_alliances.alliances)
+    teams_width = max(teams_width, len("Teams"))
+
+    # Spaces per section
+    header = f"{'#':<2} | {'Teams':<{teams_width}} | {'EPA':<6} | {'Str':<6} | {'Status':<10}\n"
+    divider = "-" * len(header) + "\n"
+
+    rows = ""
+    any_missing = False
+    for number, alliance in enumerate(event_alliances.alliances, start=1):
+        teams = " ".join(alliance.teams)
+        status = alliance.status.title() if alliance.status else "-"
+
+        # Mark totals that are missing some teams' EPAs, so they don't just look low
+        known = len(alliance.known_epas())
+        if known == 0:
+            total, strength = "-", "-"
+        else:
+            marker = "*" if known < len(alliance.teams) else ""
+            any_missing = any_missing or bool(marker)
+            total = f"{alliance.total():.1f}{marker}"
+            strength = f"{alliance.strength():.1f}{marker}"
+
+        rows += f"{number:<2} | {teams:<{teams_width}} | {total:<6} | {strength:<6} | {status:<10}\n"
+
+    final_table = f"```\n{header}{divider}{rows}```"
+    legend = "EPA is the combined EPA of the alliance, Str is the predicted strength (its best three EPAs)"
+    if any_missing:
+        legend += "\n\\* Some teams on these alliances have no EPA, so their totals are partial"
+
+    return discord.Embed(
+        title=f"Alliances for {event_alliances.event_name}",
+        description=f"{final_table}{legend}",
+        color=discord.Color.gold()
+    )
+
+
+async def setup(bot):
+    await bot.add_cog(Alliances(bot))
@@ -0,0 +1,40 @@
+# This slash command returns how much memory the TBA/Statbotics caches are using
+
+import os
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.cache import memory_summary
+
+
+class CacheStatus(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Guild syncing
+    guild_ids = []
+    main = os.getenv("guild_id")
+    dev = os.getenv("dev_guild_id")
+    if main:
+        guild_ids.append(int(main))
+    if dev:
+        guild_ids.append(int(dev))
+
+    @app_commands.guilds(*guild_ids)
+    @app_commands.command(
+        name="cache_status",
+        description="Get the memory usage of the bot's caches"
+    )
+    async def status(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title=f"Cache Status",
+            description=f"```\n{memory_summary()}\n```",
+            color=discord.Color.dark_blue()
+        )
+        await interaction.response.send_message(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(CacheStatus(bot))
@@ -1,7 +1,8 @@
-# This file is meant to be an example of how to create commands that use the TBA api and statbotics lib
+# This file is meant to be an example of how to create commands that use the TBA and statbotics apis
 # and is not loaded in main.py
 # For info on the tba api: https://www.thebluealliance.com/apidocs/v3
-# For info on the statbotics api: https://www.statbotics.io/docs/python
+# For info on the statbotics api: https://api.statbotics.io/docs
+# Requests should go through request_policy, which runs them off the event loop with timeouts and retries
 # After making your command file add a line to load it in main.py
 # The line will look like this in the load_extensions function:
 # await bot.load_extension("cogs.ExampleAPI")
@@ -9,11 +10,11 @@
 import os
 
 import discord
-import requests
-import statbotics
 from discord import app_commands
 from discord.ext import commands
 
+from utils.request_policy import Deadline, request_policy
+
 
 class ExampleAPI(commands.Cog):
     def __init__(self, bot):
@@ -40,6 +41,8 @@ class ExampleAPI(commands.Cog):
     async def example_api(self, interaction: discord.Interaction, parameter_name: int):
 
         await interaction.response.defer()
+        # Every request made for this command has to finish before the deadline
+        deadline = Deadline()
 
         try:
             tba_key = os.getenv("tba_key")
@@ -48,7 +51,13 @@ class ExampleAPI(commands.Cog):
             if not parameter_name:
                 parameter_name = "Default here"
 
-            data_request = requests.get(f"https://www.thebluealliance.com/api/v3/", headers=headers)
+            # The first argument names the endpoint, which picks its policy (see utils/request_policy.py)
+            data_request = await request_policy.get(
+                "tba.example",
+                f"https://www.thebluealliance.com/api/v3/",
+                headers=headers,
+                deadline=deadline
+            )
 
             if data_request.status_code == 401:
                 return await interaction.followup.send(f"Provide a valid TBA auth key to use TBA commands")
@@ -63,8 +72,7 @@ class ExampleAPI(commands.Cog):
                     "No data."
                 )
 
-            sb = statbotics.Statbotics()
-            stat_data = sb.get_team(2200)
+            stat_data = await request_policy.statbotics("statbotics.team", "/team/2200", deadline=deadline)
             stat_data = stat_data["name"]
 
             # To return results, either send a message or send an embed
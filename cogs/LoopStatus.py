@@ -0,0 +1,53 @@
+# Starts the event loop stall monitor, and the slash command returns what it has seen so far
+# (how often the loop was blocked, for how long, and which cog/command was responsible)
+# It also shows how long TBA/Statbotics requests are taking, since those are what commands wait on
+
+import os
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.loop_monitor import monitor
+from utils.request_policy import request_policy
+
+
+class LoopStatus(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    # The monitor has to run on the bot's loop, which is only running once the bot has started
+    @commands.Cog.listener()
+    async def on_ready(self):
+        monitor.start(self.bot)
+
+    # Guild syncing
+    guild_ids = []
+    main = os.getenv("guild_id")
+    dev = os.getenv("dev_guild_id")
+    if main:
+        guild_ids.append(int(main))
+    if dev:
+        guild_ids.append(int(dev))
+
+    @app_commands.guilds(*guild_ids)
+    @app_commands.command(
+        name="loop_status",
+        description="Get how often the bot's event loop has been blocked"
+    )
+    async def status(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title=f"Event Loop Status",
+            description=monitor.summary(),
+            color=discord.Color.red() if monitor.stall_count else discord.Color.dark_blue()
+        )
+        embed.add_field(
+            name="Upstream Requests (ms)",
+            value=f"```\n{request_policy.summary()}\n```",
+            inline=False
+        )
+        await interaction.response.send_message(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(LoopStatus(bot))
@@ -1,11 +1,17 @@
 import os
 
 import discord
-import requests
-import statbotics
 from discord import app_commands
 from discord.ext import commands
 
+from utils.cache import ByteBoundedCache
+from utils.events import get_event_name
+from utils.projections import EventRankings
+from utils.request_policy import Deadline, request_policy
+
+# Rankings change after every match, so they aren't kept for long
+rankings_cache = ByteBoundedCache("rankings", max_bytes=512 * 1024, ttl=60)
+
 
 class Rankings(commands.Cog):
     def __init__(self, bot):
@@ -32,48 +38,55 @@ class Rankings(commands.Cog):
     async def rankings(self, interaction: discord.Interaction, event_key: str):
 
         await interaction.response.defer()
+        deadline = Deadline()
 
         try:
-            tba_key = os.getenv("tba_key")
-            headers = {"X-TBA-Auth-Key": tba_key}
+            rankings = rankings_cache.get(event_key)
+
+            if rankings is None:
+                tba_key = os.getenv("tba_key")
+                headers = {"X-TBA-Auth-Key": tba_key}
+
+                data_request = await request_policy.get(
+                    "tba.rankings",
+                    f"https://www.thebluealliance.com/api/v3/event/{event_key}/rankings",
+                    headers=headers,
+                    deadline=deadline
+                )
 
-            data_request = requests.get(f"https://www.thebluealliance.com/api/v3/event/{event_key}/rankings", headers=headers)
+                if data_request.status_code == 401:
+                    return await interaction.followup.send(f"Provide a valid TBA auth key to use TBA commands")
 
-            if data_request.status_code == 401:
-                return await interaction.followup.send(f"Provide a valid TBA auth key to use TBA commands")
+                if data_request.status_code == 404:
+                    return await interaction.followup.send("Invalid event key")
 
-            if data_request.status_code == 404:
-                return await interaction.followup.send("Invalid event key")
+                if data_request.status_code != 200:
+                    print(data_request.status_code)
+                    return await interaction.followup.send(f"TBA did not provide a response")
 
-            if data_request.status_code != 200:
-                print(data_request.status_code)
-                return await interaction.followup.send(f"TBA did not provide a response")
+                data = data_request.json()
 
-            data = data_request.json()
+                if not data or 'rankings' not in data:
+                    return await interaction.followup.send("No ranking data found for this event.")
 
-            if not data or 'rankings' not in data:
-                return await interaction.followup.send("No ranking data found for this event.")
+                # Only keep the columns we display
+                rankings = EventRankings(data)
+                rankings_cache.put(event_key, rankings)
 
             # Spaces per section
             header = f"{'Rank':<4} | {'Team':<4} | {'RP':<3} | {'RS':<4} | {'W-L-T':<8}\n"
             divider = "-" * len(header) + "\n"
             
             rows = ""
-            for entry in data['rankings'][:10]: # top 10 teams
-                rank = entry['rank']
-                team = entry['team_key'].replace('frc', '')
-                rec = entry['record']
-                wlt = f"{rec['wins']}-{rec['losses']}-{rec['ties']}"
-                rp = entry['extra_stats'][0]
-                ranking_score = round(rp / entry['matches_played'], 2)
+            for rank, team, rp, matches_played, wins, losses, ties in rankings.rows(10): # top 10 teams
+                wlt = f"{wins}-{losses}-{ties}"
+                ranking_score = round(rp / matches_played, 2)
 
                 rows += f"{rank:<4} | {team:<4} | {rp:<3} | {ranking_score:<4} | {wlt:<8}\n"
 
             final_table = f"```\n{header}{divider}{rows}```"
 
-            sb = statbotics.Statbotics()
-            name = sb.get_event(event_key, ['name'])
-            name = name['name']
+            name = await get_event_name(event_key, deadline)
 
             embed = discord.Embed(
                 title=f"Rankings for {name}",
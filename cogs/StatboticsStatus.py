@@ -1,13 +1,14 @@
 # This slash command returns the current status of the blue alliance (down completely, datafeed down, up, not logged in, etc.)
 
+import asyncio
 import os
 
 import discord
-import requests
-import statbotics
 from discord import app_commands
 from discord.ext import commands
 
+from utils.request_policy import Deadline, request_policy
+
 class StatboticsStatus(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -32,18 +33,19 @@ class StatboticsStatus(commands.Cog):
 
         try:
 
-            sb = statbotics.Statbotics()
-            try:
-                sb.get_team(2200)
-                is_stat_api = True
-            except:
-                is_stat_api = False
+            # Check both at once, so a slow API can't use up the time the website check needs
+            api_result, web_result = await asyncio.gather(
+                request_policy.statbotics("statbotics.team", "/team/2200", deadline=Deadline()),
+                request_policy.get("statbotics.web", "https://statbotics.io/", deadline=Deadline()),
+                return_exceptions=True
+            )
 
-            try:
-                requests.get("https://statbotics.io/")
-                web_status = "Statbotics website appears to be functioning correctly"
-            except:
+            is_stat_api = not isinstance(api_result, Exception)
+
+            if isinstance(web_result, Exception):
                 web_status = "Statbotics website is not functioning correctly"
+            else:
+                web_status = "Statbotics website appears to be functioning correctly"
 
             if is_stat_api:
                 embed = discord.Embed(
@@ -3,11 +3,11 @@
 import os
 
 import discord
-import requests
-import statbotics
 from discord import app_commands
 from discord.ext import commands
 
+from utils.request_policy import Deadline, request_policy
+
 class TBAStatus(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -35,7 +35,12 @@ class TBAStatus(commands.Cog):
             tba_key = os.getenv("tba_key")
             headers = {"X-TBA-Auth-Key": tba_key}
 
-            data_request = requests.get(f"https://www.thebluealliance.com/api/v3/status", headers=headers)
+            data_request = await request_policy.get(
+                "tba.status",
+                f"https://www.thebluealliance.com/api/v3/status",
+                headers=headers,
+                deadline=Deadline()
+            )
 
             if data_request.status_code == 401:
                 return await interaction.followup.send(f"Not logged into TBA. \nProvide valid TBA auth key to use TBA commands")
@@ -3,18 +3,25 @@
 # It sends the "profile pic" of the team as the thumbnail of the embed
 # The colour of the embed is determined by the average colour of the profile pic
 
-import base64
+import asyncio
 import datetime
 import io
 import os
 
 import discord
 import requests
-import statbotics
-from PIL import Image
 from discord import app_commands
 from discord.ext import commands
 
+from utils.cache import ByteBoundedCache
+from utils.projections import TeamAvatar, TeamEPA, TeamInfo
+from utils.request_policy import Deadline, DeadlineExceeded, request_policy
+
+team_info_cache = ByteBoundedCache("teams", max_bytes=256 * 1024, ttl=24 * 60 * 60)
+team_epa_cache = ByteBoundedCache("epa", max_bytes=128 * 1024, ttl=60 * 60)
+# Avatars are the biggest thing we keep, so they get most of the budget
+avatar_cache = ByteBoundedCache("avatars", max_bytes=4 * 1024 * 1024, ttl=24 * 60 * 60)
+
 class TeamData(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -39,6 +46,7 @@ class TeamData(commands.Cog):
     async def team_data(self, interaction: discord.Interaction, team: int):
 
         await interaction.response.defer()
+        deadline = Deadline()
 
         try:
             tba_key = os.getenv("tba_key")
@@ -48,10 +56,10 @@ class TeamData(commands.Cog):
                 team = 2200
 
             # Get tba data
-            tba_output = await get_tba_data(interaction, team, headers)
+            tba_output = await get_tba_data(interaction, team, headers, deadline)
 
             # Get statbotics data
-            mean_epa, overall_rank, district_rank = await get_statbotics_data(interaction, team)
+            mean_epa, overall_rank, district_rank = await get_statbotics_data(interaction, team, deadline)
 
             if mean_epa and overall_rank and district_rank and tba_output:
                 output = (f"**EPA:** {mean_epa} "
@@ -62,7 +70,7 @@ class TeamData(commands.Cog):
                 output = "No data available for this team."
 
             # Get the avatar/pfp and the average color of it for the embed from a helper function
-            avatar, avg_color_hex = get_avatar_and_color(team=team, headers=headers)
+            avatar, avg_color_hex = await get_avatar_and_color(team=team, headers=headers, deadline=deadline)
 
             # Create the embed to send
             embed = discord.Embed(
@@ -82,10 +90,16 @@ class TeamData(commands.Cog):
             return await interaction.followup.send(f"An error occurred:\n```\n{e}\n```")
 
 
-async def get_tba_data(interaction: discord.Interaction, team, headers):
-    data_request = requests.get(
+async def get_tba_data(interaction: discord.Interaction, team, headers, deadline):
+    team_info = team_info_cache.get(team)
+    if team_info is not None:
+        return team_info.lines()
+
+    data_request = await request_policy.get(
+        "tba.team",
         f"https://www.thebluealliance.com/api/v3/team/frc{team}",
-        headers=headers
+        headers=headers,
+        deadline=deadline
     )
 
     if data_request.status_code == 401:
@@ -101,76 +115,60 @@ async def get_tba_data(interaction: discord.Interaction, team, headers):
             f"Team {team} exists, but has no data."
         )
 
-    # Rename name to sponsors, since that's what it actually is
-    data["sponsors"] = data.pop("name", None)
-
-    # Set a desired order for them to be displayed
-    desired_order = [
-        "nickname",
-        "rookie_year",
-        "city",
-        "state_prov",
-        "country",
-        "website",
-        "sponsors"
-    ]
-
-    # Make the output human-readable and in order
-    tba_output = []
-    for key in desired_order:
-        if key in data:
-            value = data[key] if data[key] is not None else "None"
-
-            tba_output.append(f"**{key.replace('_', ' ').title()}**: {value}")
-    return tba_output
-
-async def get_statbotics_data(interaction: discord.Interaction, team):
-    sb = statbotics.Statbotics()
-    year = datetime.datetime.now().year
-    try:
-        data = sb.get_team_year(team, year, ['epa'])
-    except Exception as e:
-        return await interaction.followup.send(f"An error occurred in statbotics:\n```\n{e}\n```")
+    # Only keep the fields we display
+    team_info = TeamInfo(data)
+    team_info_cache.put(team, team_info)
 
-    mean_epa = data["epa"]["total_points"]["mean"]
-    overall_rank = data["epa"]["ranks"]["total"]["rank"]
-    district_rank = data["epa"]["ranks"]["district"]["rank"]
+    return team_info.lines()
 
-    return mean_epa, overall_rank, district_rank
+async def get_statbotics_data(interaction: discord.Interaction, team, deadline):
+    year = datetime.datetime.now().year
 
+    team_epa = team_epa_cache.get((team, year))
+    if team_epa is None:
+        try:
+            data = await request_policy.statbotics("statbotics.team_year", f"/team_year/{team}/{year}", deadline=deadline)
+        except Exception as e:
+            return await interaction.followup.send(f"An error occurred in statbotics:\n```\n{e}\n```")
 
-# Helper function to get the avatar of the team and calc it's average color
-def get_avatar_and_color(team, headers):
-    avatar_request = requests.get(
-        f"https://www.thebluealliance.com/api/v3/team/frc{team}/media/2026",
-        headers=headers
-    )
+        team_epa = TeamEPA(data)
+        team_epa_cache.put((team, year), team_epa)
 
-    if avatar_request.status_code == 200:
-        media_list = avatar_request.json()
-        avatar_data = next(
-            (m for m in media_list if m.get("type") == "avatar"), None
-        )
+    return team_epa.mean_epa, team_epa.overall_rank, team_epa.district_rank
 
-        if avatar_data:
-            # Decode the base64 image
-            raw_image = base64.b64decode(
-                avatar_data["details"]["base64Image"]
-            )
-            image = Image.open(io.BytesIO(raw_image))
 
-            # Compute average color (lazy 1x1 resize method)
-            pixel = image.resize((1, 1)).getpixel((0, 0))
-            r, g, b = pixel[:3]  # take only RGB
-            avg_color_hex = (r << 16) + (g << 8) + b
+# Helper function to get the avatar of the team and calc it's average color
+async def get_avatar_and_color(team, headers, deadline):
+    team_avatar = avatar_cache.get(team)
 
-            # Prepare the image as a discord File
-            avatar = discord.File(
-                io.BytesIO(raw_image),
-                filename="avatar.png"
+    if team_avatar is None:
+        # The avatar is only decoration, so don't fail the whole command if it can't be fetched in time
+        try:
+            avatar_request = await request_policy.get(
+                "tba.media",
+                f"https://www.thebluealliance.com/api/v3/team/frc{team}/media/2026",
+                headers=headers,
+                deadline=deadline
             )
+        except (DeadlineExceeded, requests.RequestException):
+            return None, None
+
+        if avatar_request.status_code != 200:
+            return None, None
+
+        # Only the decoded avatar and its color are kept, the rest of the media list is dropped
+        # Parsing the media list and decoding the image is slow, so it's done off the event loop
+        team_avatar = await asyncio.to_thread(lambda: TeamAvatar(avatar_request.json()))
+        avatar_cache.put(team, team_avatar)
+
+    if team_avatar.image:
+        # Prepare the image as a discord File
+        avatar = discord.File(
+            io.BytesIO(team_avatar.image),
+            filename="avatar.png"
+        )
 
-            return avatar, avg_color_hex
+        return avatar, team_avatar.color
     return None, None
 
 
@@ -1,10 +1,11 @@
 import os
 
 import discord
-import statbotics
 from discord import app_commands
 from discord.ext import commands
 
+from utils.request_policy import Deadline, request_policy
+
 
 class Watch(commands.Cog):
     def __init__(self, bot):
@@ -33,8 +34,7 @@ class Watch(commands.Cog):
         await interaction.response.defer()
 
         try:
-            sb = statbotics.Statbotics()
-            data = sb.get_event(event_key, ['name', 'district', 'status', 'video'])
+            data = await request_policy.statbotics("statbotics.event", f"/event/{event_key}", deadline=Deadline())
 
             if data['status'] == "Completed":
                 await interaction.followup.send(f"{data['name']} {event_key[:4]} is completed and can no longer be viewed")
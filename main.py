@@ -37,6 +37,9 @@ async def load_extensions():
     await bot.load_extension("cogs.StatboticsStatus")
     await bot.load_extension("cogs.Watch")
     await bot.load_extension("cogs.Rankings")
+    await bot.load_extension("cogs.Alliances")
+    await bot.load_extension("cogs.CacheStatus")
+    await bot.load_extension("cogs.LoopStatus")
     print("Extensions all loaded")
 
 
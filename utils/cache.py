@@ -0,0 +1,131 @@
+# In-memory cache for the data the cogs pull from TBA and Statbotics
+# Entries are bounded by their actual size in bytes rather than by a count, since a single
+# avatar can be much larger than a whole rankings table
+# Only compact projections (see utils/projections.py) should be stored here, never raw JSON
+
+import sys
+import time
+from array import array
+from collections import OrderedDict
+
+# Every cache registers itself here by name so the memory usage can be summarised in one place
+# Keyed by name so reloading a cog replaces its caches instead of adding duplicates
+caches = {}
+
+# Roughly what the OrderedDict uses per entry for its hash table slot and linked list node
+# (measured with tracemalloc on CPython 3.11), which sys.getsizeof can't see
+ENTRY_OVERHEAD = 96
+
+
+# Recursively measures how many bytes an object takes up
+# Handles the types we actually store: __slots__ records, arrays, tuples, sets and scalars
+def sizeof(obj):
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, (str, bytes, int, float, bool, array)) or obj is None:
+        return size
+
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        return size + sum(sizeof(item) for item in obj)
+
+    if isinstance(obj, dict):
+        return size + sum(sizeof(k) + sizeof(v) for k, v in obj.items())
+
+    for slot in getattr(type(obj), "__slots__", ()):
+        size += sizeof(getattr(obj, slot, None))
+    return size
+
+
+class ByteBoundedCache:
+    def __init__(self, name, max_bytes, ttl=None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl  # Default time to live in seconds, None means entries never expire
+
+        # key -> (record, size, expires_at), ordered from least to most recently used
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        caches[name] = self
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        record, size, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return record
+
+    def put(self, key, record, ttl=None):
+        if key in self._entries:
+            self._remove(key)
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        # Count the bookkeeping for the entry too, for small records it's as big as the record itself
+        size = sizeof(key) + sizeof(record) + self._entry_size(expires_at)
+        # Don't let a single oversized record flush everything else out
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (record, size, expires_at)
+        self.current_bytes += size
+
+        # Evict least recently used entries until we're back under the limit
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        if key in self._entries:
+            self._remove(key)
+
+    # The (record, size, expires_at) tuple we store alongside the record, plus the OrderedDict's own overhead
+    @staticmethod
+    def _entry_size(expires_at):
+        return (sys.getsizeof((None, None, None)) + sys.getsizeof(1024) + sizeof(expires_at)
+                + ENTRY_OVERHEAD)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def format_bytes(size):
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or unit == "MiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+# Returns a human-readable table of how much memory each cache is using
+def memory_summary():
+    header = f"{'Cache':<10} | {'Items':<5} | {'Used':<9} | {'Limit':<9} | {'Hit %':<5}\n"
+    divider = "-" * len(header) + "\n"
+
+    rows = ""
+    total = 0
+    for cache in caches.values():
+        lookups = cache.hits + cache.misses
+        hit_rate = round(100 * cache.hits / lookups) if lookups else 0
+        rows += (f"{cache.name:<10} | {len(cache):<5} | {format_bytes(cache.current_bytes):<9} | "
+                 f"{format_bytes(cache.max_bytes):<9} | {hit_rate:<5}\n")
+        total += cache.current_bytes
+
+    return f"{header}{divider}{rows}\nTotal: {format_bytes(total)}"
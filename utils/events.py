@@ -0,0 +1,23 @@
+# Event names, shared by every cog that shows one
+
+from utils.cache import ByteBoundedCache
+from utils.request_policy import request_policy
+
+# Event names don't change
+event_name_cache = ByteBoundedCache("events", max_bytes=64 * 1024)
+
+
+# Returns the name of the event, or the event key if Statbotics doesn't know it
+async def get_event_name(event_key, deadline):
+    name = event_name_cache.get(event_key)
+    if name is not None:
+        return name
+
+    try:
+        data = await request_policy.statbotics("statbotics.event", f"/event/{event_key}", deadline=deadline)
+    except Exception:
+        return event_key
+
+    name = data['name']
+    event_name_cache.put(event_key, name)
+    return name
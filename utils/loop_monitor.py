@@ -0,0 +1,226 @@
+# Watches the event loop for stalls (something blocking it, like a synchronous request)
+# A small task measures how late the loop is in waking it up. A background thread watches that task,
+# and if the loop stops responding for longer than the threshold it grabs the loop's stack so we can
+# see what was blocking it and which cog/command it came from
+#
+# Configured through the dotenv:
+#   loop_stall_threshold_ms - how long the loop can be blocked before it counts as a stall (default 250)
+#   loop_monitor_strict     - set to 1 to also flag every known blocking call made on the loop (for debugging)
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+
+# Files outside of this folder (the standard library, discord.py, requests, etc.) are never blamed for a stall
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COGS_DIR = os.path.join(PROJECT_ROOT, "cogs")
+# The monitor's own frames (like the strict mode wrappers) are never blamed either
+MONITOR_FILE = os.path.abspath(__file__)
+
+
+class Stall:
+    __slots__ = ("duration", "cog", "command", "location", "stack", "time")
+
+    def __init__(self, duration, cog, command, location, stack):
+        self.duration = duration
+        self.cog = cog
+        self.command = command
+        self.location = location
+        self.stack = stack
+        self.time = time.time()
+
+
+class LoopMonitor:
+    def __init__(self, threshold=0.25, interval=0.05, strict=False):
+        self.threshold = threshold  # Seconds the loop can be blocked before it counts as a stall
+        self.interval = interval  # How often the loop is checked
+        self.strict = strict
+
+        self.loop = None
+        self.loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._last_beat = 0.0
+        self._captured = None  # (last_beat, cog, command, location, stack) grabbed by the watchdog
+
+        # Maps the code of each app command callback to its (cog, command) name
+        self._command_code = {}
+
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.total_stall_time = 0.0
+        self.stalls_by_command = Counter()
+        self.recent_stalls = deque(maxlen=10)
+        self.blocking_calls = Counter()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    # Starts monitoring the current loop. Safe to call more than once (on_ready can fire on reconnects)
+    def start(self, bot):
+        if self.running:
+            return
+
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self._command_code = {
+            command.callback.__code__: (type(cog).__name__, command.qualified_name)
+            for cog in bot.cogs.values()
+            for command in cog.walk_app_commands()
+            if hasattr(command, "callback")
+        }
+
+        if self.strict:
+            self._enable_strict_mode()
+
+        self._last_beat = time.monotonic()
+        self._task = self.loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def _heartbeat(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+
+            # How much later than requested the loop got back to us
+            lag = now - start - self.interval
+            self.max_lag = max(self.max_lag, lag)
+
+            if lag >= self.threshold:
+                self._record_stall(lag)
+
+            self._captured = None
+            self._last_beat = now
+
+    # Runs on its own thread, since it has to keep working while the loop is blocked
+    def _watch(self):
+        while self.running:
+            time.sleep(self.interval)
+
+            last_beat = self._last_beat
+            blocked_for = time.monotonic() - last_beat - self.interval
+            captured = self._captured
+            if blocked_for < self.threshold or (captured is not None and captured[0] == last_beat):
+                continue
+
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+
+            stack = traceback.extract_stack(frame)
+            self._captured = (last_beat, *self._attribute(frame, stack), stack)
+
+    def _record_stall(self, duration):
+        captured = self._captured
+        if captured is not None and captured[0] == self._last_beat:
+            _, cog, command, location, stack = captured
+        else:
+            # The loop came back before the watchdog could look at it
+            cog, command, location, stack = None, None, None, None
+
+        stall = Stall(duration, cog, command, location, stack)
+        self.stall_count += 1
+        self.total_stall_time += duration
+        self.stalls_by_command[(cog, command)] += 1
+        self.recent_stalls.append(stall)
+
+        source = f"/{command} ({cog})" if command else cog or "unknown"
+        print(f"Event loop stalled for {duration * 1000:.0f}ms in {source}"
+              + (f" at {location}" if location else ""))
+        if stack:
+            print("".join(traceback.format_list(stack)), end="")
+
+    # Works out which cog and command a stack belongs to, and the line in our code that was running
+    def _attribute(self, frame, stack):
+        cog = None
+        command = None
+
+        while frame is not None:
+            match = self._command_code.get(frame.f_code)
+            if match:
+                cog, command = match
+                break
+            if cog is None and frame.f_code.co_filename.startswith(COGS_DIR):
+                cog = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+            frame = frame.f_back
+
+        location = None
+        for entry in reversed(stack):
+            if entry.filename.startswith(PROJECT_ROOT) and os.path.abspath(entry.filename) != MONITOR_FILE:
+                location = f"{os.path.relpath(entry.filename, PROJECT_ROOT)}:{entry.lineno} ({entry.name})"
+                break
+
+        return cog, command, location
+
+    # Strict mode: asyncio's debug mode reports slow callbacks, and known blocking calls are flagged
+    # whenever they're made on the loop's thread
+    def _enable_strict_mode(self):
+        self.loop.set_debug(True)
+        self.loop.slow_callback_duration = self.threshold
+
+        import requests
+        requests.Session.request = self._flag_blocking(requests.Session.request, "requests")
+        time.sleep = self._flag_blocking(time.sleep, "time.sleep")
+
+    def _flag_blocking(self, func, name):
+        # Don't wrap twice if the monitor is restarted
+        if getattr(func, "__flagged_blocking__", False):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if threading.get_ident() == self.loop_thread_id:
+                frame = sys._getframe(1)
+                stack = traceback.extract_stack(frame)
+                cog, command, location = self._attribute(frame, stack)
+                self.blocking_calls[(cog, command, name)] += 1
+
+                source = f"/{command} ({cog})" if command else cog or "unknown"
+                print(f"Blocking call to {name} on the event loop from {source}"
+                      + (f" at {location}" if location else ""))
+            return func(*args, **kwargs)
+
+        wrapper.__flagged_blocking__ = True
+        return wrapper
+
+    # Returns a human-readable summary of the stalls seen so far
+    def summary(self):
+        output = (f"**Stalls:** {self.stall_count} (over {self.threshold * 1000:.0f}ms)"
+                  f"\n**Total Stalled Time:** {self.total_stall_time * 1000:.0f}ms"
+                  f"\n**Max Lag:** {self.max_lag * 1000:.0f}ms"
+                  f"\n**Strict Mode:** {'On' if self.strict else 'Off'}\n")
+
+        if self.stalls_by_command:
+            output += "\n**Stalls by command:**\n"
+            for (cog, command), count in self.stalls_by_command.most_common(5):
+                source = f"/{command} ({cog})" if command else cog or "unknown"
+                output += f"{source}: {count}\n"
+
+        if self.recent_stalls:
+            output += "\n**Recent stalls:**\n"
+            for stall in reversed(self.recent_stalls):
+                source = f"/{stall.command}" if stall.command else stall.cog or "unknown"
+                output += f"<t:{int(stall.time)}:R> {stall.duration * 1000:.0f}ms in {source}"
+                output += f" at `{stall.location}`\n" if stall.location else "\n"
+
+        if self.blocking_calls:
+            output += "\n**Blocking calls on the loop:**\n"
+            for (cog, command, name), count in self.blocking_calls.most_common(5):
+                source = f"/{command} ({cog})" if command else cog or "unknown"
+                output += f"{name} from {source}: {count}\n"
+
+        return output
+
+
+monitor = LoopMonitor(
+    threshold=int(os.getenv("loop_stall_threshold_ms", 250)) / 1000,
+    strict=os.getenv("loop_monitor_strict", "0").lower() in ("1", "true", "yes")
+)
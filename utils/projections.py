@@ -0,0 +1,170 @@
+# Compact versions of the TBA and Statbotics responses the cogs use
+# The raw responses carry a lot we never display (base64 blobs for every media type, sort_orders,
+# extra_stats for every team, etc.), so only the fields we need are kept before anything is cached
+
+import base64
+import io
+import math
+import time
+from array import array
+
+from PIL import Image
+
+
+class TeamInfo:
+    # The order the fields are displayed in
+    fields = (
+        "nickname",
+        "rookie_year",
+        "city",
+        "state_prov",
+        "country",
+        "website",
+        "sponsors"
+    )
+    __slots__ = fields
+
+    def __init__(self, data):
+        # TBA calls the sponsors "name", so rename it to what it actually is
+        data = dict(data)
+        data["sponsors"] = data.pop("name", None)
+
+        for key in self.fields:
+            setattr(self, key, data.get(key))
+
+    # Makes the output human-readable and in order
+    def lines(self):
+        output = []
+        for key in self.fields:
+            value = getattr(self, key)
+            value = value if value is not None else "None"
+
+            output.append(f"**{key.replace('_', ' ').title()}**: {value}")
+        return output
+
+
+class TeamEPA:
+    __slots__ = ("mean_epa", "overall_rank", "district_rank")
+
+    def __init__(self, data):
+        epa = data["epa"]
+        self.mean_epa = epa["total_points"]["mean"]
+        self.overall_rank = epa["ranks"]["total"]["rank"]
+        self.district_rank = epa["ranks"]["district"]["rank"]
+
+
+class TeamAvatar:
+    # image is the decoded png (or None if the team has no avatar), color is its average color
+    __slots__ = ("image", "color")
+
+    def __init__(self, media_list):
+        self.image = None
+        self.color = None
+
+        avatar_data = next(
+            (m for m in media_list if m.get("type") == "avatar"), None
+        )
+
+        if avatar_data:
+            # Decode the base64 image, we only keep the bytes
+            self.image = base64.b64decode(
+                avatar_data["details"]["base64Image"]
+            )
+            image = Image.open(io.BytesIO(self.image))
+
+            # Compute average color (lazy 1x1 resize method)
+            pixel = image.resize((1, 1)).getpixel((0, 0))
+            r, g, b = pixel[:3]  # take only RGB
+            self.color = (r << 16) + (g << 8) + b
+
+
+class EventRankings:
+    # Stored as columns of typed arrays instead of a list of dicts
+    # Team numbers stay as strings since offseason events can have B teams (ex. '2200B')
+    __slots__ = ("rank", "team", "rp", "matches_played", "wins", "losses", "ties")
+
+    def __init__(self, data):
+        self.rank = array("H")
+        team = []
+        self.rp = array("d")
+        self.matches_played = array("H")
+        self.wins = array("H")
+        self.losses = array("H")
+        self.ties = array("H")
+
+        for entry in data["rankings"]:
+            rec = entry["record"]
+            self.rank.append(entry["rank"])
+            team.append(entry["team_key"].replace("frc", ""))
+            self.rp.append(entry["extra_stats"][0])
+            self.matches_played.append(entry["matches_played"])
+            self.wins.append(rec["wins"])
+            self.losses.append(rec["losses"])
+            self.ties.append(rec["ties"])
+
+        self.team = tuple(team)
+
+    def __len__(self):
+        return len(self.rank)
+
+    # Yields (rank, team, rp, matches_played, wins, losses, ties) for the first `limit` teams
+    def rows(self, limit=None):
+        count = len(self) if limit is None else min(limit, len(self))
+        for i in range(count):
+            rp = self.rp[i]
+            yield (
+                self.rank[i],
+                self.team[i],
+                int(rp) if rp.is_integer() else rp,
+                self.matches_played[i],
+                self.wins[i],
+                self.losses[i],
+                self.ties[i]
+            )
+
+
+class Alliance:
+    # epas lines up with teams, nan where Statbotics has no EPA for the team
+    __slots__ = ("teams", "epas", "status")
+
+    def __init__(self, data, team_epas):
+        self.teams = tuple(team.replace("frc", "") for team in data["picks"])
+        self.epas = array("d", (team_epas.get(team, math.nan) for team in self.teams))
+
+        status = data.get("status") or {}
+        self.status = status.get("status")
+
+    def known_epas(self):
+        return [epa for epa in self.epas if not math.isnan(epa)]
+
+    # Combined EPA of every team on the alliance
+    def total(self):
+        return sum(self.known_epas())
+
+    # Only three robots play at a time, so the predicted strength is the best three EPAs
+    def strength(self):
+        return sum(sorted(self.known_epas(), reverse=True)[:3])
+
+
+class EventAlliances:
+    # etag is from TBA, so we can check if the alliances changed without downloading them again
+    # checked_at is the last time TBA was asked, and finished is set once a winner has been decided
+    # looked_up is every team Statbotics has been asked about, including ones it had no EPA for
+    __slots__ = ("event_name", "alliances", "looked_up", "etag", "checked_at", "finished")
+
+    def __init__(self, event_name, data, team_epas, looked_up, etag):
+        self.event_name = event_name
+        self.alliances = tuple(Alliance(alliance, team_epas) for alliance in data)
+        self.looked_up = frozenset(looked_up)
+        self.etag = etag
+        self.checked_at = time.monotonic()
+        self.finished = any(alliance.status == "won" for alliance in self.alliances)
+
+    # team -> EPA for every team with a known EPA, so they can be reused if the picks haven't changed
+    def team_epas(self):
+        return {
+            team: epa
+            for alliance in self.alliances
+            for team, epa in zip(alliance.teams, alliance.epas)
+            if not math.isnan(epa)
+        }
@@ -0,0 +1,219 @@
+# Request policy for the calls we make to TBA and Statbotics
+# Every call runs off the event loop on its own thread pool with a per-endpoint timeout that the
+# transport enforces, so a hung upstream can't tie up threads the rest of the bot needs
+# Transient failures (timeouts, connection errors, 5xx, 429) are retried with jittered exponential backoff, and slow requests can
+# be hedged by sending a second copy once the first has taken longer than that endpoint's usual p95
+# All of it has to fit inside the command's deadline, so a slow upstream can't hold a command up forever
+# Only use this for reads (GETs), since those are safe to send more than once
+# Statbotics is called through its REST API rather than the statbotics library, since the library
+# has no timeout and turns every error status into an exception we can't tell apart from a bad request
+
+import asyncio
+import random
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# How long a command has to get its data together before we give up and reply with an error
+COMMAND_BUDGET = 10
+
+STATBOTICS_API = "https://api.statbotics.io/v3"
+
+# Requests get their own threads so losing hedges and timed out attempts (which keep running until
+# their transport timeout) can't hold up asyncio.to_thread work elsewhere in the bot
+executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="request-policy")
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class StatboticsError(Exception):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds=COMMAND_BUDGET):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return self.expires_at - time.monotonic()
+
+
+class EndpointPolicy:
+    def __init__(self, timeout, retries=2, base_delay=0.25, max_delay=2.0, hedge=False, hedge_after=1.0):
+        self.timeout = timeout  # Seconds a single attempt can take
+        self.retries = retries  # Extra attempts after the first one
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_after = hedge_after  # Hedge delay to use until we've seen enough requests to know the p95
+
+
+# Endpoints that aren't listed here use the default policy
+policies = {
+    "tba.rankings": EndpointPolicy(timeout=4, hedge=True),
+    "tba.team": EndpointPolicy(timeout=4, hedge=True),
+    "tba.media": EndpointPolicy(timeout=5, hedge=True),
+    "tba.alliances": EndpointPolicy(timeout=4, hedge=True),
+    "tba.status": EndpointPolicy(timeout=4, retries=1),
+    "statbotics.event": EndpointPolicy(timeout=5, hedge=True),
+    "statbotics.team_year": EndpointPolicy(timeout=5, hedge=True),
+    "statbotics.team": EndpointPolicy(timeout=5, retries=1),
+    "statbotics.team_events": EndpointPolicy(timeout=6, hedge=True),
+    "statbotics.web": EndpointPolicy(timeout=5, retries=1),
+}
+default_policy = EndpointPolicy(timeout=5)
+
+# Statuses worth trying again, anything else is the real answer
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Number of latencies we need for an endpoint before trusting its p95
+MIN_SAMPLES = 20
+
+
+class RequestPolicy:
+    def __init__(self):
+        # endpoint -> recent latencies of attempts, in seconds
+        # Attempts that timed out are included (as the timeout), so slow requests still count towards the p95
+        self.latencies = {}
+        # endpoint -> number of retries/hedge requests sent
+        self.retries = Counter()
+        self.hedges = Counter()
+
+    # GET a url under the endpoint's policy. Returns the response (which may still be an error status,
+    # if retrying didn't help), or raises if no response could be had before the deadline
+    async def get(self, endpoint, url, headers=None, params=None, deadline=None):
+        latencies = self.latencies.setdefault(endpoint, deque(maxlen=200))
+
+        # Runs on the executor, so the time spent waiting for a free thread isn't counted
+        def send(timeout):
+            start = time.monotonic()
+            try:
+                response = requests.get(url, headers=headers, params=params, timeout=timeout)
+            except requests.Timeout:
+                latencies.append(time.monotonic() - start)
+                raise
+            latencies.append(time.monotonic() - start)
+            return response
+
+        return await self._run(endpoint, send, deadline)
+
+    # GET a path from the Statbotics API (ex. "/event/2025onham") and return the json
+    async def statbotics(self, endpoint, path, params=None, deadline=None):
+        response = await self.get(endpoint, f"{STATBOTICS_API}{path}", params=params, deadline=deadline)
+
+        if response.status_code != 200:
+            raise StatboticsError(f"Statbotics returned {response.status_code} for {path}")
+
+        return response.json()
+
+    async def _run(self, endpoint, send, deadline):
+        policy = policies.get(endpoint, default_policy)
+        deadline = deadline or Deadline()
+
+        for attempt in range(policy.retries + 1):
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"{endpoint} did not respond in time")
+
+            timeout = min(policy.timeout, remaining)
+            try:
+                result = await self._attempt(endpoint, policy, send, timeout)
+                if not _should_retry(result):
+                    return result
+                error = None
+            except (asyncio.TimeoutError, requests.ConnectionError, requests.Timeout) as e:
+                result = None
+                error = e
+
+            # Full jitter, so retries from several commands don't all land at once
+            delay = random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** attempt))
+            if attempt == policy.retries or delay >= deadline.remaining():
+                break
+
+            self.retries[endpoint] += 1
+            await asyncio.sleep(delay)
+
+        if result is not None:
+            return result
+        if isinstance(error, (asyncio.TimeoutError, requests.Timeout)):
+            raise DeadlineExceeded(f"{endpoint} did not respond in time") from error
+        raise error
+
+    # One attempt, which may send a hedge request if the first is slower than usual
+    async def _attempt(self, endpoint, policy, send, timeout):
+        expires_at = time.monotonic() + timeout
+
+        loop = asyncio.get_running_loop()
+
+        def start_request():
+            return asyncio.ensure_future(loop.run_in_executor(executor, send, timeout))
+
+        tasks = [start_request()]
+        try:
+            hedge_after = self._hedge_delay(endpoint, policy)
+            if policy.hedge and hedge_after < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done:
+                    self.hedges[endpoint] += 1
+                    tasks.append(start_request())
+
+            # Use whichever request finishes first, unless it failed and the other is still going
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=expires_at - time.monotonic(),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+            if error is not None:
+                raise error
+            raise asyncio.TimeoutError()
+        finally:
+            # The threads can't be stopped, but their transport timeout ends them and their results are no longer wanted
+            for task in tasks:
+                task.cancel()
+
+    def percentile(self, endpoint, percent):
+        samples = sorted(self.latencies.get(endpoint, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    # Returns a human-readable table of each endpoint's latency, retries and hedges
+    def summary(self):
+        header = f"{'Endpoint':<22} | {'p50':<5} | {'p95':<5} | {'p99':<5} | {'Retry':<5} | {'Hedge':<5}\n"
+        divider = "-" * len(header) + "\n"
+
+        rows = ""
+        for endpoint in sorted(self.latencies):
+            if not self.latencies[endpoint]:
+                continue
+            p50, p95, p99 = (round(self.percentile(endpoint, p) * 1000) for p in (50, 95, 99))
+            rows += (f"{endpoint:<22} | {p50:<5} | {p95:<5} | {p99:<5} | "
+                     f"{self.retries[endpoint]:<5} | {self.hedges[endpoint]:<5}\n")
+
+        return f"{header}{divider}{rows}" if rows else "No requests yet"
+
+    def _hedge_delay(self, endpoint, policy):
+        if len(self.latencies.get(endpoint, ())) < MIN_SAMPLES:
+            return policy.hedge_after
+        return self.percentile(endpoint, 95)
+
+
+def _should_retry(result):
+    return isinstance(result, requests.Response) and result.status_code in RETRY_STATUSES
+
+
+request_policy = RequestPolicy()